@@ -7,16 +7,68 @@ import re
 import argparse
 import hashlib
 import json
+import shlex
 import shutil
 import sys
-from typing import Optional, Union, List
+import time
+from typing import Optional, Union, List, Dict, Tuple, Set
+
+# Use orjson for the build config if installed (optional)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
 BUILD_CONFIG = "build.json"
 CMAKE = "CMakeLists.txt"
 CMAKE_CACHE = "CMakeCache.txt"
 
+# Modification times closer than this (in seconds) to now are not trusted
+MTIME_GRACE = 2
+
+# Version of the CMakeLists.txt parsing, parsed files stored in the build config with another version are parsed again
+PARSER_VERSION = 3
+
 SOURCE_FORMAT = "bash -c 'source {} ; {}'"
 
+# Platform the script runs on (doesn't change while running)
+_IS_WINDOWS = platform.system() == "Windows"
+_IS_LINUX = platform.system() == "Linux"
+
+# Patterns used to parse CMakeLists.txt (compiled once)
+# Character classes instead of .+ keep the matching linear on long lines
+# CMake syntax is ASCII, so \s and \S don't need to consider Unicode
+_PROJECT_RE = re.compile(r"^\s*project\s*\(\s*([^)\s]+)", re.ASCII)
+# Start of a project() call which continues on the next lines
+_PROJECT_START_RE = re.compile(r"^\s*project\s*(\([^)]*)?$", re.ASCII)
+_SUBDIR_RE = re.compile(r"^\s*add_subdirectory\s*\(\s*([^)\s]+)", re.ASCII)
+_EXEC_RE = re.compile(r"^\s*add_executable\s*\(\s*([^)\s]+)\s+([^)]+)\)", re.ASCII)
+_VAR_RE = re.compile(r"\s*(\$\{\S+\})\s*", re.ASCII)
+
+# Argument on a Windows command line, double quoted parts may contain whitespace
+_WINDOWS_ARG_RE = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+# Single quoted, double quoted and unquoted parts of a shell command line (or a single unbalanced quote)
+_SHELL_PART_RE = re.compile(r"""'[^']*'|"(?:\\.|[^"\\])*"|[^'"]+|['"]""")
+# ~ at the start of a word
+_TILDE_RE = re.compile(r"(?<=\s)~(?=/|\s|$)")
+
+# Translation table to escape quotes
+_QUOTE_TABLE = str.maketrans({'"': r'\"', "'": r"\'"})
+
+# Parsed CMakeLists.txt files: (abspath, mtime_ns, size) -> (project name, commands)
+_PARSE_CACHE: Dict[Tuple[str, int, int], Tuple[Optional[str], List[Tuple[str, str]]]] = {}
+# Parsed CMakeLists.txt files loaded from the build config: abspath -> {"hash", "mtime_ns", "size", "parser", "name", "commands"}
+_STORED_RECORDS: Dict[str, dict] = {}
+# Parsed CMakeLists.txt files reached in this run, stored in the build config (same format)
+_FILE_RECORDS: Dict[str, dict] = {}
+# Listed directories: path -> names of the entries (see path_exists())
+_DIR_ENTRIES: Dict[str, Set[str]] = {}
+
 
 class Project():
     def __init__(
@@ -42,23 +94,23 @@ class Project():
 
         self.set_os_specific()
 
-        # Assign executable path for each executable (and for each sub project)
-        exec_paths: dict[str, str] = {exec: os.path.join(self.executables_dir, exec) for exec in self.executables}
+        # Assign executable path (with the OS specific extension) for each executable
+        # and take over the ones of each sub project, which are already assigned
+        exec_ext = ".exe" if _IS_WINDOWS else ""
+        exec_paths: dict[str, str] = {exec: os.path.join(self.executables_dir, exec + exec_ext) for exec in self.executables}
         for proj in self.subprojects.values():
-            exec_paths.update({exec: os.path.join(proj.executables_dir, exec) for exec in proj.executables})
+            exec_paths.update(proj.executables_paths)
 
         self.executables_paths = exec_paths
 
         # Add all executables of subprojects in the project
-        for proj in self.subprojects.values():
-            self.executables.extend(proj.executables)
+        self.executables = list(exec_paths)
 
         if executable == "default" or executable is None:
             self.executable = self.name
         else:
             self.executable = executable
 
-        self.set_exec_ext()
         if self.executable in self.executables_paths:
             self.run_path = self.executables_paths[self.executable]
 
@@ -79,7 +131,7 @@ class Project():
 
     def set_os_specific(self) -> None:
         """Sets OS specific variables (build related)"""
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             self.info_msg = "Generating Windows build files ..."
             if self.root:
                 self.build_dir = os.path.join(self.root.dir, "build\\windows\\")
@@ -87,7 +139,7 @@ class Project():
             else:
                 self.build_dir = os.path.join(self.dir, "build\\windows\\")
                 self.executables_dir = os.path.join(self.build_dir, "Debug\\")
-        elif platform.system() == "Linux":
+        elif _IS_LINUX:
             self.info_msg = "Generating Linux build files ..."
             if self.root:
                 self.build_dir = os.path.join(self.root.dir, "build/linux/")
@@ -99,18 +151,11 @@ class Project():
             print("[ERROR]: Unsupported platform.", file=sys.stderr)
             quit(1)
 
-    def set_exec_ext(self) -> None:
-        """Sets executable extension depending on the OS"""
-        if platform.system() == "Windows":
-            for exec in self.executables_paths:
-                path = self.executables_paths[exec]
-                self.executables_paths[exec] = f"{path}.exe"
-
     def set_run_path(self) -> None:
         """Sets run path for the project (OS specific)"""
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             self.run_path = os.path.join(self.build_dir, "Debug", os.path.dirname(self.dir), f"{self.executable}.exe")
-        elif platform.system() == "Linux":
+        elif _IS_LINUX:
             self.run_path = os.path.join(self.build_dir, os.path.dirname(self.dir), self.executable)
         else:
             print("[ERROR]: Unsupported platform.", file=sys.stderr)
@@ -120,28 +165,19 @@ class Project():
         """Get a dict of Projects that are defined in subdirectories of the Project"""
         subprojects = {}
 
-        with open(file_path, encoding="utf-8") as file:
-            lines = file.readlines()
-
-        for line in lines:
+        _, commands = _parse_cmakelists(file_path)
+        for command, value in commands:
             # Search for project definition
-            project_pattern = re.compile(r"^\s*project\s*\(\s*(.+)\s*\)\s*")
-            project_match = project_pattern.match(line)
-            if project_match:
-                project_name = project_match.group(1)
-                if project_name != self.name:
+            if command == "project":
+                if value != self.name:
                     if self.root:
-                        subprojects[project_name] = Project(project_name, dir=os.path.dirname(file_path), root=self.root)
+                        subprojects[value] = Project(value, dir=os.path.dirname(file_path), root=self.root)
                     else:
-                        subprojects[project_name] = Project(project_name, dir=os.path.dirname(file_path), root=self)
+                        subprojects[value] = Project(value, dir=os.path.dirname(file_path), root=self)
 
             # Search for subdirectory definitions to search for defined projects there as well
-            subdirectory_pattern = re.compile(r"\s*add_subdirectory\s*\(\s*(.+)\s*\)\s*")
-            subdirectory_match = subdirectory_pattern.match(line)
-            if subdirectory_match:
-                subdirectory = subdirectory_match.group(1)
-
-                new_path = os.path.join(os.path.dirname(file_path), subdirectory, CMAKE)
+            elif command == "add_subdirectory":
+                new_path = os.path.join(os.path.dirname(file_path), value, CMAKE)
 
                 # Recursive call of the function
                 subprojects.update(self.get_subprojects(new_path))
@@ -150,46 +186,29 @@ class Project():
 
     def get_executable_names(self, file_path: str) -> List[str]:
         """Get a list of defined the defined executable names from the given CMakeLists.txt"""
-        with open(file_path, encoding="utf-8") as file:
-            lines = file.readlines()
-
         executables = []
-        for line in lines:
-            # Ignore comment lines
-            if line.startswith("#"):
-                continue
 
+        _, commands = _parse_cmakelists(file_path)
+        for command, value in commands:
             # Search for project definition, return if project definition found
             # Sub projects executables will be handled with creation of projects through get_subprojects()
-            project_pattern = re.compile(r"^\s*project\s*\(\s*(.+)\s*\)\s*")
-            project_match = project_pattern.match(line)
-            if project_match:
-                project_name = project_match.group(1)
-                if project_name != self.name:
+            if command == "project":
+                if value != self.name:
                     return executables
 
             # Search for subdirectory definitions to search for defined executables there as well
-            subdirectory_pattern = re.compile(r"\s*add_subdirectory\s*\(\s*(.+)\s*\)\s*")
-            subdirectory_match = subdirectory_pattern.match(line)
-            if subdirectory_match:
-                subdirectory = subdirectory_match.group(1)
-
-                new_path = os.path.join(os.path.dirname(file_path), subdirectory, CMAKE)
+            elif command == "add_subdirectory":
+                new_path = os.path.join(os.path.dirname(file_path), value, CMAKE)
 
                 # Recursive call of the function
                 executables.extend(self.get_executable_names(new_path))
-                continue
 
             # Search for executable definition
-            executable_name_pattern = re.compile(r"\s*add_executable\s*\(\s*(\S+)\s+(.+)\s*\)\s*")
-            executable_name_match = executable_name_pattern.match(line)
-
-            if executable_name_match:
-                name = executable_name_match.group(1)
-                if name == "${PROJECT_NAME}":
+            elif command == "add_executable":
+                if value == "${PROJECT_NAME}":
                     executables.append(get_project_name(file_path))
                 else:
-                    executables.append(name)
+                    executables.append(value)
 
         return executables
     
@@ -219,18 +238,141 @@ class Project():
 def read_build_conf(file_path: str) -> dict:
     """Read build config file and return json obj"""
     config = ""
-    with open(file_path, "r", encoding="utf-8") as file:
-        config = json.load(file)
+    with open(file_path, "rb") as file:
+        config = _loads(file.read())
     
     return config
 
+def write_build_conf(file_path: str, config: dict) -> None:
+    """Write json obj to the build config file"""
+    with open(file_path, "wb") as file:
+        file.write(_dumps(config))
+
 def update_build_conf(file_path: str, cmake_path: str) -> None:
-    """Updates build config with the current file hash of CMakeLists.txt"""
-    config = {
-        "cmakelists_hash": get_file_hash(cmake_path)
+    """Updates build config with the current file hash of CMakeLists.txt and the parsed CMakeLists.txt files"""
+    config = read_build_conf(file_path) if os.path.exists(file_path) else {}
+    config["cmakelists_hash"] = get_file_hash(cmake_path)
+
+    # Don't store a modification time that is too recent to be trusted (coarse timestamps)
+    stat = os.stat(cmake_path)
+    config["cmakelists_mtime_ns"] = stat.st_mtime_ns if not is_recently_modified(stat) else None
+    config["cmakelists_size"] = stat.st_size
+    config["files"] = _FILE_RECORDS
+    write_build_conf(file_path, config)
+
+def update_build_conf_files(file_path: str) -> None:
+    """Updates build config with the parsed CMakeLists.txt files"""
+    config = read_build_conf(file_path) if os.path.exists(file_path) else {}
+    config["files"] = _FILE_RECORDS
+    write_build_conf(file_path, config)
+
+def update_build_conf_snapshot(file_path: str, snapshot: dict, options: List[str]) -> None:
+    """Updates build config with the snapshot of the project files of the last successful build"""
+    config = read_build_conf(file_path) if os.path.exists(file_path) else {}
+    config["source_snapshot"] = snapshot
+    config["snapshot_options"] = options
+    write_build_conf(file_path, config)
+
+def is_inside(path: str, dirs: Set[str]) -> bool:
+    """Return True if path is one of the directories or inside of one, otherwise False"""
+    return any(path == dir or path.startswith(dir + os.sep) for dir in dirs)
+
+def get_source_snapshot(project: "Project", exclude: List[Optional[str]]) -> Dict[str, list]:
+    """
+    Return {path: [mtime_ns, size]} of all files in the directories of the parsed CMakeLists.txt files
+    (project directory and all directories added with add_subdirectory), without the build directory and hidden directories.
+    @exclude can be specified with additional files or directories to leave out.
+    The directories are walked by their real path, so symlinked directories are included.
+    Files modified too recently to be trusted are stored with a mtime of None, see snapshot_unchanged().
+    """
+    excluded = {os.path.abspath(path) for path in exclude if path}
+    excluded.add(os.path.abspath(os.path.join(project.dir, "build")))
+    excluded_real = {os.path.realpath(path) for path in excluded}
+
+    # Use the real paths, so symlinked directories (e.g. add_subdirectory of a linked directory) are walked as well
+    roots = sorted({os.path.realpath(os.path.dirname(path)) for path in _FILE_RECORDS} | {os.path.realpath(project.dir)},
+                   key=len)
+    excluded |= excluded_real
+
+    # Walk every directory only once, even if nested in another one
+    walked: Set[str] = set()
+
+    snapshot = {}
+    for root in roots:
+        if is_inside(root, walked) or is_inside(root, excluded_real):
+            continue
+        walked.add(root)
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [dir for dir in dirnames
+                           if not dir.startswith(".") and os.path.join(dirpath, dir) not in excluded]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if path in excluded:
+                    continue
+
+                # Only follow symlinks to existing files outside of the excluded paths
+                # (e.g. not compile_commands.json -> build/linux/compile_commands.json)
+                stat = os.lstat(path)
+                if os.path.islink(path):
+                    target = os.path.realpath(path)
+                    if os.path.exists(target) and not is_inside(target, excluded_real):
+                        stat = os.stat(path)
+                snapshot[path] = [stat.st_mtime_ns if not is_recently_modified(stat) else None, stat.st_size]
+
+    return snapshot
+
+def snapshot_unchanged(stored: Optional[dict], snapshot: dict) -> bool:
+    """Return True if the snapshot equals the stored one and has no untrusted (None) modification time, otherwise False"""
+    if stored != snapshot:
+        return False
+
+    return all(mtime is not None for mtime, _ in snapshot.values())
+
+def load_file_records(records: dict, verify: bool = True) -> None:
+    """
+    Load parsed CMakeLists.txt files stored in the build config, so unchanged files are not parsed again.
+    Records are kept if modification time and size of the file didn't change.
+    @verify keeps records of files with a changed modification time or size as well, if the file hash still matches.
+    Records of another PARSER_VERSION are always dropped.
+    """
+    _STORED_RECORDS.clear()
+    for path, record in records.items():
+        if record.get("parser") != PARSER_VERSION:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        if (record.get("mtime_ns") is None or record["mtime_ns"] != stat.st_mtime_ns
+                or record.get("size") != stat.st_size or is_recently_modified(stat)):
+            if not verify or record.get("hash") != get_file_hash(path):
+                continue
+            # Unchanged content, store the new modification time and size
+            record = dict(record, **get_stat_record(stat))
+
+        _STORED_RECORDS[path] = record
+
+def get_stat_record(stat: os.stat_result) -> dict:
+    """Return modification time and size to store for a file, the modification time is None if it is too recent to be trusted"""
+    return {
+        "mtime_ns": stat.st_mtime_ns if not is_recently_modified(stat) else None,
+        "size": stat.st_size
     }
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(config, file)
+
+def is_recently_modified(stat: os.stat_result) -> bool:
+    """Return True if the file was modified within MTIME_GRACE seconds, otherwise False"""
+    return time.time() - stat.st_mtime < MTIME_GRACE
+
+def cmakelists_stat_changed(build_conf: dict, cmake_path: str) -> bool:
+    """Return True if modification time or size of CMakeLists.txt differ from the ones in the build config, otherwise False"""
+    stat = os.stat(cmake_path)
+    if is_recently_modified(stat):
+        return True
+
+    return (build_conf.get("cmakelists_mtime_ns") != stat.st_mtime_ns
+            or build_conf.get("cmakelists_size") != stat.st_size)
 
 def file_changed_in_git(file_name: str) -> bool:
     """Return True if file has been modified since last commit, otherwise False"""
@@ -241,41 +383,162 @@ def file_changed_in_git(file_name: str) -> bool:
     return hash_output1 == hash_output2
 
 def get_file_hash(file_path: str) -> str:
-    """Gets file hash (in sha1) of the given file path"""
-    BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
+    """Gets file hash (in blake2b) of the given file path"""
+    with open(file_path, 'rb') as f:
+        # Python 3.11+ hashes the file in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "blake2b").hexdigest()
 
-    sha1 = hashlib.sha1()
+        BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
 
-    with open(file_path, 'rb') as f:
+        blake2b = hashlib.blake2b()
         while True:
             data = f.read(BUF_SIZE)
             if not data:
                 break
-            sha1.update(data)
+            blake2b.update(data)
     
-    return sha1.hexdigest()
+    return blake2b.hexdigest()
 
-def get_project_name(file_path: str) -> str:
-    """Get the project name defined in the CMakelists.txt file (in project(_))"""
+def _parse_cmakelists(file_path: str) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+    """
+    Parse the given CMakeLists.txt in a single pass and return the first project name (or None)
+    and the ordered list of (command, value) for its project, add_subdirectory and add_executable commands.
+    Results are cached by the absolute path, modification time and size of the file.
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if key in _PARSE_CACHE:
+        return _PARSE_CACHE[key]
+
+    # Use the record from the build config if there is one
+    record = _STORED_RECORDS.get(key[0])
+    if record is not None:
+        _FILE_RECORDS[key[0]] = record
+        _PARSE_CACHE[key] = (record["name"], [tuple(command) for command in record["commands"]])
+        return _PARSE_CACHE[key]
+
+    project_name = None
+    commands = []
     with open(file_path, encoding="utf-8") as file:
-        data = file.read()
+        for line in file:
+            # Ignore empty and comment lines, only run the patterns on relevant commands
+            line = line.lstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("project"):
+                # Read the whole call if it's spread over multiple lines
+                if _PROJECT_START_RE.match(line):
+                    for next_line in file:
+                        line += next_line
+                        if ")" in next_line:
+                            break
+
+                match = _PROJECT_RE.match(line)
+                if match:
+                    if project_name is None:
+                        project_name = match.group(1)
+                    commands.append(("project", match.group(1)))
+            elif line.startswith("add_subdirectory"):
+                match = _SUBDIR_RE.match(line)
+                if match:
+                    commands.append(("add_subdirectory", match.group(1)))
+            elif line.startswith("add_executable"):
+                match = _EXEC_RE.match(line)
+                if match:
+                    commands.append(("add_executable", match.group(1)))
+
+    _FILE_RECORDS[key[0]] = {
+        "hash": get_file_hash(file_path),
+        **get_stat_record(stat),
+        "parser": PARSER_VERSION,
+        "name": project_name,
+        "commands": commands
+    }
+    _PARSE_CACHE[key] = (project_name, commands)
+    return _PARSE_CACHE[key]
 
-    project_name_pattern = re.compile(r"^\s*project\s*\(\s*(.+)\s*\)\s*", re.M)
-    project_name_match = project_name_pattern.search(data)
+def get_project_name(file_path: str) -> str:
+    """Get the project name defined in the CMakelists.txt file (in project(_))"""
+    project_name, _ = _parse_cmakelists(file_path)
 
-    if project_name_match:
-        return project_name_match.group(1)
+    if project_name is not None:
+        return project_name
     else:
         raise Exception("Could not find the project name in CMakeLists.txt")
 
 def check_cmakelists_exists(file_path: str) -> bool:
     """Return True if CMakeLists.txt exists, otherwise False"""
-    return os.path.exists(file_path)
+    return path_exists(file_path)
+
+def get_dir_entries(dir: str) -> Set[str]:
+    """Return the names of all entries in the directory, or an empty set if it doesn't exist"""
+    try:
+        with os.scandir(dir) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+def path_exists(path: str) -> bool:
+    """
+    Return True if path exists, otherwise False.
+    The parent directory is listed only once and answers all further checks in it,
+    call _DIR_ENTRIES.clear() after creating or deleting files.
+    Names not found in the listing are checked with os.path.exists, as the file system may be case-insensitive.
+    """
+    parent, name = os.path.split(os.path.normpath(path))
+    parent = parent or "."
+    if parent not in _DIR_ENTRIES:
+        _DIR_ENTRIES[parent] = get_dir_entries(parent)
+
+    return name in _DIR_ENTRIES[parent] or os.path.exists(path)
 
 def check_cache_exists() -> bool:
     """Return True if CMakeCache.txt exists, otherwise False"""
     return os.path.exists(CMAKE_CACHE)
 
+def run_command(command: List[str], source: str = "") -> subprocess.CompletedProcess:
+    """Run the command directly, or in a shell after sourcing @source if specified"""
+    if source:
+        return subprocess.run(SOURCE_FORMAT.format(source, " ".join(command)), shell=True)
+
+    return subprocess.run(command)
+
+def expand_options(options: str) -> str:
+    """
+    Return options with environment variables expanded outside of single quotes
+    and ~ expanded at the start of unquoted words, like the shell does
+    """
+    expanded = []
+    for match in _SHELL_PART_RE.finditer(options):
+        part = match.group(0)
+        if part.startswith("'"):
+            expanded.append(part)
+            continue
+
+        if not part.startswith('"'):
+            # Prefix whether the part starts a word, so a leading ~ is only expanded then
+            at_word_start = match.start() == 0 or options[match.start() - 1].isspace()
+            prefix = " " if at_word_start else "_"
+            part = _TILDE_RE.sub(lambda tilde: os.path.expanduser("~"), prefix + part)[1:]
+        expanded.append(os.path.expandvars(part))
+
+    return "".join(expanded)
+
+def split_options(options: str) -> List[str]:
+    """
+    Split options into arguments to run the command without a shell.
+    On Linux quotes are handled like the shell does, see expand_options() for the expansions.
+    On Windows backslashes are kept, quotes removed (like the command line parsing of programs does)
+    and environment variables expanded.
+    Raise ValueError if a quote isn't closed.
+    """
+    if _IS_WINDOWS:
+        return [os.path.expandvars(option).replace('"', '') for option in _WINDOWS_ARG_RE.findall(options)]
+
+    return shlex.split(expand_options(options))
+
 def beautiy(s: str) -> str:
     """Return decoration around a string"""
     return f"|---- {s} ----|"
@@ -302,16 +565,11 @@ def rmtree_error_handler(func, path, exc_info):
 
 def check_cmake_exists() -> bool:
     """Return True if cmake command is found, otherwise False"""
-    try:
-        subprocess.check_output(["cmake"])
-        return True
-    except:
-        return False
+    return shutil.which("cmake") is not None
 
 def is_cmake_variable(string: str) -> bool:
     """Return True if string is of this pattern ${variable}, otherwise False"""
-    variable_pattern = re.compile(r"\s*(\$\{\S+\})\s*")
-    match = variable_pattern.search(string)
+    match = _VAR_RE.search(string)
     
     if match:
         return True
@@ -320,43 +578,29 @@ def is_cmake_variable(string: str) -> bool:
 
 def prepend_directory(path: str, dir: str) -> str:
     """Prepend directory to path to a file, for example: ("path/cmakelists.txt", "dir") -> "path/dir/cmakelists.txt\""""
-    path_list = path.split("/")
-    suffix = path_list[len(path_list) - 1]
-    prefix_list = path_list[:len(path_list) - 1]
-
-    prefix = ""
-    if len(prefix_list) > 1:
-        prefix = "/".join(prefix_list)
-    if len(prefix_list) == 1:
-        prefix = prefix_list[0]
-    if len(prefix_list) > 0:
-        prefix += "/"
-
-    return f"{prefix}{dir}/{suffix}"
+    return os.path.join(os.path.dirname(path), dir, os.path.basename(path))
 
 def escape_quotes(string: str) -> str:
     """Return the same string with all quotes escaped in it"""
-    result = string
-    result = re.sub(r'"', r'\"', result)
-    result = re.sub(r"'", r"\'", result)
-    return result
+    return string.translate(_QUOTE_TABLE)
 
 def get_quoted_string(strings: Union[str, List[str]], all=False) -> str:
     """
     Return quoted string with all quotes in the string escaped, from a list of strings.
-    @all can be specified, to quote each string. Otherwise it will only quote the the strings 
+    @all can be specified, to quote each string. Otherwise it will only quote the strings
+    containing quotes or whitespace, so each string stays a single argument
     """
-    if isinstance(strings, str):
-        escaped_strings = escape_quotes(strings)
-    else:
-        escaped_strings = escape_quotes(" ".join(strings))
+    items = strings.split(" ") if isinstance(strings, str) else strings
 
-    if all:
-        quoted_string = " ".join([fr'"{item}"' for item in escaped_strings.split(" ")])
-    else:
-        quoted_string = " ".join([fr'"{item}"' if ('"' in item) or ("'" in item) else item for item in escaped_strings.split(" ")])
-        
-    return quoted_string
+    quoted_items = []
+    for item in items:
+        escaped_item = item.translate(_QUOTE_TABLE)
+        if all or escaped_item != item or any(char.isspace() for char in item):
+            quoted_items.append(f'"{escaped_item}"')
+        else:
+            quoted_items.append(escaped_item)
+
+    return " ".join(quoted_items)
 
 ###########################################################################
 
@@ -387,6 +631,8 @@ def main():
     parser.add_argument("-b", "--binary-dir",
                         help="path to the folder to copy the executables (binaries) to",
                         nargs="?", default=None)
+    parser.add_argument("--noop-skip", dest="noop_skip", action="store_true",
+                        help="skip running cmake if no file in the project changed since the last successful build")
 
     args, other_args = parser.parse_known_args()
 
@@ -406,6 +652,11 @@ def main():
         print("[ERROR]: CMake is not installed or not in the PATH.", file=sys.stderr)
         return 1
 
+    # Load parsed CMakeLists.txt files of the last run (unchanged files are not parsed again)
+    build_conf = read_build_conf(build_conf_path) if path_exists(build_conf_path) else {}
+    file_records = build_conf.get("files", {})
+    load_file_records(file_records, verify=not args.ignore)
+
     # Create Project object with specified executable --run argument, otherwise project name is used
     project = Project(executable=args.executable, dir=args.path, binary_dir=args.binary_dir)
 
@@ -420,84 +671,109 @@ def main():
         other_args.pop(idx)
     
     # Get cmake options to pass to
-    if args.gen_options:
-        gen_options = args.gen_options
-        gen_options = gen_options[0].split()
-    else:
-        gen_options = []
-    if args.build_options:
-        build_options = args.build_options
-        build_options = build_options[0].split()
-    else:
-        build_options = []
+    # (joined again for the shell when sourcing, otherwise split like the shell would)
+    try:
+        if args.gen_options:
+            gen_options = args.gen_options
+            gen_options = gen_options[0].split() if args.source else split_options(gen_options[0])
+        else:
+            gen_options = []
+        if args.build_options:
+            build_options = args.build_options
+            build_options = build_options[0].split() if args.source else split_options(build_options[0])
+        else:
+            build_options = []
+    except ValueError as e:
+        print(f"[ERROR]: Invalid cmake options: {e}", file=sys.stderr)
+        return 1
 
     # To save if CMakeLists.txt is modified
     modified = False
 
     # Create build config file to store file hash
     # in order to check if it has been modified
-    if not os.path.exists(build_conf_path):
+    if not path_exists(build_conf_path):
         print(beautiy(f"Creating {build_conf_path} file..."))
-        with open(build_conf_path, "w") as f:
-            json.dump({}, f)
+        write_build_conf(build_conf_path, {})
+        _DIR_ENTRIES.clear()
         update_build_conf(build_conf_path, cmake_path)
 
     # Ignore changes in CMakeLists.txt
     if not args.ignore:
         build_conf = read_build_conf(build_conf_path)
         if "cmakelists_hash" in build_conf:
-            if build_conf["cmakelists_hash"] != get_file_hash(cmake_path):
-                print(beautiy("CMakeLists.txt was changed!"))
-                print(beautiy(f"Saving new file hash to {build_conf_path}"))
-                modified = True
+            # Only hash the file if its modification time or size changed
+            if cmakelists_stat_changed(build_conf, cmake_path):
+                if build_conf["cmakelists_hash"] != get_file_hash(cmake_path):
+                    print(beautiy("CMakeLists.txt was changed!"))
+                    print(beautiy(f"Saving new file hash to {build_conf_path}"))
+                    modified = True
                 update_build_conf(build_conf_path, cmake_path)
         else:
             update_build_conf(build_conf_path, cmake_path)
 
+    # Save newly parsed CMakeLists.txt files
+    if _FILE_RECORDS != file_records:
+        update_build_conf_files(build_conf_path)
+
     # Get the project name defined from CMakelists.txt
-    project_name = get_project_name(cmake_path)
+    project_name = project.name
 
     # Delete build directory if switch -d was given
-    if os.path.exists(project.build_dir) and args.delete:
+    if args.delete and path_exists(project.build_dir):
         print(beautiy(f"Deleting {project.build_dir}"))
         shutil.rmtree(project.build_dir, onerror=rmtree_error_handler)
+        _DIR_ENTRIES.clear()
 
     cache_file = os.path.join(project.build_dir, CMAKE_CACHE)
 
-    if args.source:
-        # Return if --source was executed on windows
-        if platform.system() == "Windows":
-            print("[ERROR]: Sourcing (--source) a file is currently not supported on Windows.", file=sys.stderr)
-            return 1
-        source_cmd = SOURCE_FORMAT
-    else:
-        source_cmd = "{}{}"
+    # Return if --source was executed on windows
+    if args.source and _IS_WINDOWS:
+        print("[ERROR]: Sourcing (--source) a file is currently not supported on Windows.", file=sys.stderr)
+        return 1
+
+    # Snapshot of the project files to skip cmake if nothing changed since the last successful build
+    snapshot = {}
+    snapshot_options = gen_options + build_options + [args.source]
+    if args.noop_skip:
+        snapshot = get_source_snapshot(project, [build_conf_path, args.binary_dir])
 
     proc = None
-    # If the CMakeCache.txt doesn't exist or it was modified then generate cache
-    if not os.path.exists(cache_file) or modified:
-        print(beautiy(f"Configuring project: {project_name} ..."))
-        print(beautiy(project.info_msg))
-        print(beautiy("Generating CMake cache ..."))
-        subprocess.run(source_cmd.format(args.source, " ".join(
-            ["cmake", args.path, "-B", project.build_dir] + gen_options)), shell=True)
-
-    print(beautiy(f"Building project: {project_name} ..."))
-    proc = subprocess.run(source_cmd.format(args.source, " ".join(
-        ["cmake", "--build", project.build_dir] + build_options)), shell=True)
-    if proc.returncode != 0:
-        print(beautiy("Build process failed!"), file=sys.stderr)
-        # If there was an error and -f switch wasn't given, quit
-        if not args.force:
-            return proc.returncode
+    if (args.noop_skip and not args.force and not args.delete and not modified and path_exists(cache_file)
+            and all(path_exists(exec_path) for exec_path in project.executables_paths.values())
+            and snapshot_unchanged(build_conf.get("source_snapshot"), snapshot)
+            and build_conf.get("snapshot_options") == snapshot_options):
+        print(beautiy(f"Project is up-to-date: {project_name}"))
+    else:
+        # If the CMakeCache.txt doesn't exist or it was modified then generate cache
+        if not path_exists(cache_file) or modified:
+            print(beautiy(f"Configuring project: {project_name} ..."))
+            print(beautiy(project.info_msg))
+            print(beautiy("Generating CMake cache ..."))
+            run_command(["cmake", args.path, "-B", project.build_dir] + gen_options, args.source)
+
+        # Build in parallel, unless a parallel level was given in the build options or CMAKE_BUILD_PARALLEL_LEVEL
+        if ("CMAKE_BUILD_PARALLEL_LEVEL" not in os.environ
+                and not any(option.startswith(("-j", "--parallel")) for option in build_options)):
+            build_options = ["--parallel", str(os.cpu_count() or 1)] + build_options
+
+        print(beautiy(f"Building project: {project_name} ..."))
+        proc = run_command(["cmake", "--build", project.build_dir] + build_options, args.source)
+        if proc.returncode != 0:
+            print(beautiy("Build process failed!"), file=sys.stderr)
+            # If there was an error and -f switch wasn't given, quit
+            if not args.force:
+                return proc.returncode
+        elif args.noop_skip:
+            update_build_conf_snapshot(build_conf_path, snapshot, snapshot_options)
     
-    if proc.returncode == 0 and args.binary_dir:
+    if (proc is None or proc.returncode == 0) and args.binary_dir:
         print(beautiy(f"Copying executables to: {args.binary_dir} ..."))
-        for exec_path in project.executables_paths.values():
-            binary_path = args.binary_dir
+        binary_path = args.binary_dir
 
-            # Create directories if needed
-            os.makedirs(binary_path, exist_ok=True)
+        # Create directories if needed
+        os.makedirs(binary_path, exist_ok=True)
+        for exec_path in project.executables_paths.values():
             dst = os.path.join(binary_path, os.path.basename(exec_path))
             try:
                 shutil.copyfile(exec_path, dst)
@@ -519,17 +795,24 @@ def main():
             run_msg = ""
         print(beautiy(f"Running {run_msg}{project_name}"))
 
-        raw_other_args = get_quoted_string(other_args)
         try:
             if args.executable == "default":
-                proc = subprocess.run(source_cmd.format(args.source, " ".join(
-                    [project.run_path, raw_other_args])), shell=True)
+                run_path = project.run_path
+            else:
+                run_path = project.executables_paths[args.executable]
+
+            # Arguments only need to be quoted if they are passed through the shell
+            if args.source:
+                proc = run_command([run_path, get_quoted_string(other_args)], args.source)
             else:
-                proc = subprocess.run(source_cmd.format(args.source, " ".join(
-                    [project.executables_paths[args.executable], raw_other_args])), shell=True)
+                proc = run_command([run_path] + other_args)
 
             return proc.returncode
-        except:
+        except OSError as e:
+            # Same return codes as the shell for an executable which is not found or can't be executed
+            print(f"[ERROR]: Cannot run {run_path}: {e.strerror}", file=sys.stderr)
+            return 127 if isinstance(e, FileNotFoundError) else 126
+        except KeyboardInterrupt:
             print(beautiy(f"{run_msg}{project_name} Stopped"))
             return 1
 